@@ -5,17 +5,18 @@ LangGraph + CopilotKit agent with Redis Cloud long-term memory + Web Search.
 from tools.tavily_agent import create_tavily_search_tool_node, tavily_search
 from tools.product_analyzer import analyze_product_marketing
 
-from typing import Any, List
+from typing import Any, List, Union
 from typing_extensions import Literal
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, BaseMessage
+from langchain_core.messages import SystemMessage, BaseMessage, message_chunk_to_message
 from langchain_core.runnables import RunnableConfig
 from langchain.tools import tool
 from langgraph.graph import StateGraph, END
 from langgraph.types import Command
 from langgraph.graph import MessagesState
 from langgraph.prebuilt import ToolNode
-import redis
+from redis import asyncio as aioredis
+import functools
 import ssl
 import os
 
@@ -23,16 +24,27 @@ import os
 # Redis Cloud Long-Term Memory
 # ----------------------------------------------------------------------
 
-redis_client = redis.Redis(
+# A long-lived pool keeps TLS connections open across requests instead of
+# renegotiating after Redis Cloud idles them out.
+redis_pool = aioredis.ConnectionPool(
+    connection_class=aioredis.SSLConnection,  # REQUIRED for Redis Cloud
     host=os.getenv("REDIS_HOST"),
     port=int(os.getenv("REDIS_PORT")),
     username=os.getenv("REDIS_USERNAME"),
     password=os.getenv("REDIS_PASSWORD"),
-    ssl=True,           # REQUIRED for Redis Cloud
     ssl_cert_reqs=None,
-    decode_responses=True
+    max_connections=32,
+    socket_keepalive=True,
+    health_check_interval=30,
+    # Replies stay as bytes; tools decode only what they return to the model
+    decode_responses=False
 )
 
+redis_client = aioredis.Redis(connection_pool=redis_pool)
+
+# Only the most recent searches are kept per user so profile reads stay small
+SEARCH_HISTORY_LIMIT = 200
+
 # ----------------------------------------------------------------------
 # Agent State
 # ----------------------------------------------------------------------
@@ -46,24 +58,47 @@ class AgentState(MessagesState):
 # ----------------------------------------------------------------------
 
 
+def _as_values(value: Union[str, List[str]]) -> List[str]:
+    """Normalize a single value or a list of values, dropping empty strings."""
+    values = [value] if isinstance(value, str) else value
+    return [v for v in values if v]
+
+
 @tool
-def update_shopping_profile(user_id: str, category: str = "", search_term: str = ""):
-    """Update Redis Cloud shopping profile."""
-    if category:
-        redis_client.sadd(f"user:{user_id}:categories", category)
-    if search_term:
-        redis_client.rpush(f"user:{user_id}:search_history", search_term)
+async def update_shopping_profile(
+    user_id: str,
+    category: Union[str, List[str]] = "",
+    search_term: Union[str, List[str]] = "",
+):
+    """Update Redis Cloud shopping profile.
+
+    `category` and `search_term` accept a single value or a list of values.
+    """
+    categories = _as_values(category)
+    search_terms = _as_values(search_term)
+
+    # Queue both writes so they reach Redis Cloud in a single round-trip
+    pipe = redis_client.pipeline(transaction=False)
+    if categories:
+        pipe.sadd(f"user:{user_id}:categories", *categories)
+    if search_terms:
+        history_key = f"user:{user_id}:search_history"
+        pipe.rpush(history_key, *search_terms)
+        pipe.ltrim(history_key, -SEARCH_HISTORY_LIMIT, -1)
+    await pipe.execute()
     return "Shopping profile updated."
 
 
 @tool
-def get_shopping_profile(user_id: str):
+async def get_shopping_profile(user_id: str):
     """Retrieve the long-term profile from Redis Cloud."""
-    categories = list(redis_client.smembers(f"user:{user_id}:categories"))
-    history = redis_client.lrange(f"user:{user_id}:search_history", 0, -1)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.smembers(f"user:{user_id}:categories")
+    pipe.lrange(f"user:{user_id}:search_history", 0, -1)
+    categories, history = await pipe.execute()
     return {
-        "categories": categories,
-        "search_history": history,
+        "categories": [c.decode() for c in categories],
+        "search_history": [h.decode() for h in history],
     }
 
 
@@ -74,14 +109,31 @@ backend_tools = [
     analyze_product_marketing,
 ]
 
-backend_tool_names = [tool.name for tool in backend_tools]
+backend_tool_names = frozenset(tool.name for tool in backend_tools)
 
 # ----------------------------------------------------------------------
 # Chat Node (ReAct)
 # ----------------------------------------------------------------------
 
+# Constant part of the system prompt; only the shopping profile changes per turn
+_SYSTEM_PREFIX = (
+    "You are a shopping assistant agent with long-term memory stored in Redis. "
+    "Your primary goal is to analyze products for manipulative marketing tactics. "
+    "When the user asks you to analyze a product, you MUST use the `analyze_product_marketing` tool. "
+    "You must provide realistic values for all tool parameters, including a list of suspected tactics. "
+    "When relevant, use the `tavily_search` tool to perform deep research web searches. "
+    "Current shopping profile: "
+)
+
+
+@functools.cache
+def _get_model() -> ChatOpenAI:
+    """Return a shared chat model so its HTTP connection pool is reused across turns."""
+    return ChatOpenAI(model="gpt-4o")
+
+
 async def chat_node(state: AgentState, config: RunnableConfig):
-    model = ChatOpenAI(model="gpt-4o")
+    model = _get_model()
 
     model_with_tools = model.bind_tools(
         [
@@ -92,20 +144,26 @@ async def chat_node(state: AgentState, config: RunnableConfig):
     )
 
     system_message = SystemMessage(
-        content=(
-            "You are a shopping assistant agent with long-term memory stored in Redis. "
-            "Your primary goal is to analyze products for manipulative marketing tactics. "
-            "When the user asks you to analyze a product, you MUST use the `analyze_product_marketing` tool. "
-            "You must provide realistic values for all tool parameters, including a list of suspected tactics. "
-            "When relevant, use the `tavily_search` tool to perform deep research web searches. "
-            f"Current shopping profile: {state.get('shopping_profile', {})}"
-        )
+        content=_SYSTEM_PREFIX + str(state.get("shopping_profile", {}))
     )
 
-    response = await model_with_tools.ainvoke(
+    # Stream the completion so tokens reach LangGraph's message stream as they
+    # arrive, then merge the chunks into the final message for the state.
+    response = None
+    async for chunk in model_with_tools.astream(
         [system_message, *state["messages"]],
         config
-    )
+    ):
+        response = chunk if response is None else response + chunk
+
+    if response is None:
+        # The stream produced no chunks; fall back to a regular completion
+        response = await model_with_tools.ainvoke(
+            [system_message, *state["messages"]],
+            config
+        )
+    else:
+        response = message_chunk_to_message(response)
 
     if route_to_tool_node(response):
         return Command(
@@ -124,10 +182,7 @@ def route_to_tool_node(response: BaseMessage):
     if not tool_calls:
         return False
 
-    for tc in tool_calls:
-        if tc.get("name") in backend_tool_names:
-            return True
-    return False
+    return any(tc.get("name") in backend_tool_names for tc in tool_calls)
 
 
 # ----------------------------------------------------------------------
@@ -144,4 +199,7 @@ workflow.add_node("tool_node", ToolNode(tools=backend_tools))
 workflow.add_edge("tool_node", "chat_node")
 workflow.set_entry_point("chat_node")
 
+# No checkpointer here: the LangGraph server (`langgraph dev` / platform) that
+# serves this graph attaches its own and persists each thread's state, and it
+# replaces any checkpointer compiled into the graph.
 graph = workflow.compile()
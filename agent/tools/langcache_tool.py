@@ -1,13 +1,21 @@
 # tools/langcache_tool.py
 from typing import Optional, Dict, List
+import asyncio
+import functools
+import logging
 import os
+import re
+
+import httpx
 
 # LangGraph Tool Decorator and ToolNode
 from langchain.tools import tool
 from langgraph.prebuilt import ToolNode
+from pydantic import BaseModel, Field
 
 # LangCache imports
 from langcache import LangCache
+from langcache.errors import LangCacheError, NoResponseError
 from langcache.models import SearchStrategy
 
 # ChatOpenAI for summarization
@@ -22,12 +30,34 @@ lang_cache = LangCache(
     api_key=os.getenv('LANGCACHE_API_KEY', '')
 )
 
+logger = logging.getLogger(__name__)
+
+# Failures a LangCache call can raise: HTTP error responses, no response at
+# all, and transport problems such as an unreachable or malformed host
+_LANG_CACHE_ERRORS = (LangCacheError, NoResponseError, httpx.HTTPError, httpx.InvalidURL)
+
+# Summaries are memoized under their own entry type, keyed on the text prefix
+_SUMMARY_CACHE_ATTRIBUTES = {"type": "summary_cache"}
+_SUMMARY_CACHE_PROMPT_CHARS = 512
+
+
+@functools.cache
+def _get_summary_model() -> ChatOpenAI:
+    """Return a shared summarization model so its HTTP connection pool is reused.
+    
+    Summarization is a simple compression task, so the smaller model is used;
+    temperature 0 keeps summaries deterministic for the LangCache memo.
+    """
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0)
+
 
 def _summarize_product_text_helper(product_text: str) -> str:
     """Helper function to summarize product text using ChatOpenAI.
     
     This is the core summarization logic that can be called directly
-    or through the tool wrapper.
+    or through the tool wrapper. Summaries are memoized in LangCache, so
+    near-identical product text is answered from the cache instead of
+    calling the model again.
     
     Args:
         product_text: The full product description text to summarize
@@ -35,21 +65,172 @@ def _summarize_product_text_helper(product_text: str) -> str:
     Returns:
         A summarized version of the product text as a string.
     """
+    cached = _get_cached_summary(product_text)
+    if cached is not None:
+        return cached
+    
+    return _summarize_uncached(product_text)
+
+
+def _summary_prompt(product_text: str) -> str:
+    """Build the single-product summarization prompt."""
+    return (
+        "Summarize the following product description into key points focusing on "
+        "features, specifications, and benefits. Keep it concise and informative:\n\n"
+        f"{product_text}"
+    )
+
+
+def _summarize_uncached(product_text: str) -> str:
+    """Summarize product text with the model and memoize the result."""
     try:
-        model = ChatOpenAI(model="gpt-4o")
+        model = _get_summary_model()
+        response = model.invoke([HumanMessage(content=_summary_prompt(product_text))])
+        summary = response.content if hasattr(response, 'content') else str(response)
+    except Exception as e:
+        return f"Error summarizing product text: {str(e)}"
+    
+    _cache_summary(product_text, summary)
+    return summary
+
+
+async def _summarize_uncached_async(product_text: str) -> str:
+    """Async variant of `_summarize_uncached`."""
+    try:
+        model = _get_summary_model()
+        response = await model.ainvoke([HumanMessage(content=_summary_prompt(product_text))])
+        summary = response.content if hasattr(response, 'content') else str(response)
+    except Exception as e:
+        return f"Error summarizing product text: {str(e)}"
+    
+    await _cache_summary_async(product_text, summary)
+    return summary
+
+
+def _get_cached_summary(product_text: str) -> Optional[str]:
+    """Return a memoized summary for near-identical text, or None on a miss.
+    
+    LangCache failures are logged and treated as a miss so they never block
+    summarization.
+    """
+    try:
+        res = lang_cache.search(
+            prompt=product_text[:_SUMMARY_CACHE_PROMPT_CHARS],
+            attributes=_SUMMARY_CACHE_ATTRIBUTES,
+            similarity_threshold=0.9,
+            search_strategies=[SearchStrategy.SEMANTIC]
+        )
+    except _LANG_CACHE_ERRORS as e:
+        logger.warning("Summary cache lookup failed: %s", e)
+        return None
+    
+    return res.data[0].response if res.data else None
+
+
+async def _get_cached_summary_async(product_text: str) -> Optional[str]:
+    """Async variant of `_get_cached_summary`."""
+    try:
+        res = await lang_cache.search_async(
+            prompt=product_text[:_SUMMARY_CACHE_PROMPT_CHARS],
+            attributes=_SUMMARY_CACHE_ATTRIBUTES,
+            similarity_threshold=0.9,
+            search_strategies=[SearchStrategy.SEMANTIC]
+        )
+    except _LANG_CACHE_ERRORS as e:
+        logger.warning("Summary cache lookup failed: %s", e)
+        return None
+    
+    return res.data[0].response if res.data else None
+
+
+def _cache_summary(product_text: str, summary: str) -> None:
+    """Memoize a summary in LangCache, logging (not raising) on failure."""
+    try:
+        lang_cache.set(
+            prompt=product_text[:_SUMMARY_CACHE_PROMPT_CHARS],
+            response=summary,
+            attributes=_SUMMARY_CACHE_ATTRIBUTES
+        )
+    except _LANG_CACHE_ERRORS as e:
+        logger.warning("Summary cache write failed: %s", e)
+
+
+async def _cache_summary_async(product_text: str, summary: str) -> None:
+    """Async variant of `_cache_summary`."""
+    try:
+        await lang_cache.set_async(
+            prompt=product_text[:_SUMMARY_CACHE_PROMPT_CHARS],
+            response=summary,
+            attributes=_SUMMARY_CACHE_ATTRIBUTES
+        )
+    except _LANG_CACHE_ERRORS as e:
+        logger.warning("Summary cache write failed: %s", e)
+
+
+async def _summarize_bulk(texts: List[str]) -> List[str]:
+    """Summarize several product texts with a single ChatOpenAI call.
+    
+    All texts are looked up in the LangCache memo concurrently. The misses
+    are packed into one numbered prompt and the response is split back into
+    one summary per text, which are then memoized concurrently. If the
+    response cannot be split cleanly, each of those texts is summarized
+    individually instead, also concurrently.
+    
+    Args:
+        texts: The full product description texts to summarize
         
+    Returns:
+        A list of summaries in the same order as `texts`.
+    """
+    summaries = list(await asyncio.gather(
+        *(_get_cached_summary_async(text) for text in texts)
+    ))
+    misses = [i for i, summary in enumerate(summaries) if summary is None]
+    
+    generated = await _summarize_uncached_bulk([texts[i] for i in misses])
+    for i, summary in zip(misses, generated):
+        summaries[i] = summary
+    
+    return summaries
+
+
+async def _summarize_uncached_bulk(texts: List[str]) -> List[str]:
+    """Summarize texts known to miss the memo with one model call and memoize them."""
+    if len(texts) <= 1:
+        return [await _summarize_uncached_async(text) for text in texts]
+    
+    try:
+        model = _get_summary_model()
+        
+        numbered = "\n\n".join(
+            f"### {i}\n{text}" for i, text in enumerate(texts, start=1)
+        )
         prompt = (
-            "Summarize the following product description into key points focusing on "
-            "features, specifications, and benefits. Keep it concise and informative:\n\n"
-            f"{product_text}"
+            "Summarize each of the following numbered product descriptions into key points "
+            "focusing on features, specifications, and benefits. Keep each summary concise "
+            "and informative. Start each summary with its number on its own line, formatted "
+            "exactly like `### 1`, and output nothing else:\n\n"
+            f"{numbered}"
         )
         
-        response = model.invoke([HumanMessage(content=prompt)])
-        summary = response.content if hasattr(response, 'content') else str(response)
-        
-        return summary
+        response = await model.ainvoke([HumanMessage(content=prompt)])
+        content = response.content if hasattr(response, 'content') else str(response)
     except Exception as e:
-        return f"Error summarizing product text: {str(e)}"
+        logger.warning("Bulk summarization failed, summarizing individually: %s", e)
+        return list(await asyncio.gather(*(_summarize_uncached_async(text) for text in texts)))
+    
+    parts = re.split(r"^###\s*(\d+)\s*$", content, flags=re.MULTILINE)
+    # parts = [preamble, "1", summary1, "2", summary2, ...]
+    numbered_summaries = {int(num): text.strip() for num, text in zip(parts[1::2], parts[2::2])}
+    if sorted(numbered_summaries) != list(range(1, len(texts) + 1)):
+        logger.warning("Bulk summary response could not be split, summarizing individually")
+        return list(await asyncio.gather(*(_summarize_uncached_async(text) for text in texts)))
+    
+    summaries = [numbered_summaries[i] for i in range(1, len(texts) + 1)]
+    await asyncio.gather(
+        *(_cache_summary_async(text, summary) for text, summary in zip(texts, summaries))
+    )
+    return summaries
 
 
 @tool
@@ -69,7 +250,7 @@ def summarize_product_text(product_text: str) -> str:
 
 
 @tool
-def store_product(
+async def store_product(
     product_url: str,
     description: str,
     summary: Optional[str] = None,
@@ -77,8 +258,10 @@ def store_product(
 ) -> Dict:
     """Store product information in LangCache.
     
-    Stores the product URL, description, and summary as three separate entries
-    in LangCache. If summary is not provided, it will be automatically generated.
+    Stores the product as a single LangCache entry whose response is the
+    summary and whose attributes carry the URL and description, so a single
+    search returns the whole product. If summary is not provided, it will be
+    automatically generated.
     
     Args:
         product_url: The URL of the product page
@@ -87,48 +270,85 @@ def store_product(
         user_id: Optional user identifier for filtering
         
     Returns:
-        Dictionary containing the results of storing all three entries.
+        Dictionary containing the result of storing the product entry.
     """
     # Generate summary if not provided
     if summary is None:
-        summary = _summarize_product_text_helper(description)
+        summary = await asyncio.to_thread(_summarize_product_text_helper, description)
     
-    # Prepare base attributes shared by all entries
-    base_attributes = {"product_url": product_url}
-    if user_id:
-        base_attributes["user_id"] = user_id
+    return await _store_product_entry(product_url, description, summary, user_id)
+
+
+class ProductInput(BaseModel):
+    product_url: str = Field(..., description="The URL of the product page")
+    description: str = Field(..., description="The full product description text")
+    summary: Optional[str] = Field(
+        default=None,
+        description="Optional pre-generated summary. If omitted, it will be auto-generated."
+    )
+
+
+@tool
+async def store_products(
+    products: List[ProductInput],
+    user_id: Optional[str] = None
+) -> List[Dict]:
+    """Store several products in LangCache at once.
     
-    results = {}
+    Behaves like `store_product` for each item, but any missing summaries are
+    generated together in a single AI call.
     
-    # Store URL entry
-    url_attributes = {**base_attributes, "type": "product_url"}
-    results["url_entry"] = lang_cache.set(
-        prompt=f"product_url:{product_url[:50]}",
-        response=product_url,
-        attributes=url_attributes
-    )
+    Args:
+        products: The products to store, each with a URL, description and optional summary
+        user_id: Optional user identifier for filtering
+        
+    Returns:
+        List with the store results for each product, in input order.
+    """
+    # Generate all missing summaries in one call; they come back in input order
+    generated = iter(await _summarize_bulk(
+        [item.description for item in products if not item.summary]
+    ))
     
-    # Store description entry
-    desc_attributes = {**base_attributes, "type": "product_description"}
-    results["description_entry"] = lang_cache.set(
-        prompt=f"product_description:{product_url[:50]}:{description[:40]}",
-        response=description,
-        attributes=desc_attributes
-    )
+    # Write every product's entry concurrently
+    return list(await asyncio.gather(*(
+        _store_product_entry(
+            item.product_url,
+            item.description,
+            item.summary or next(generated),
+            user_id
+        )
+        for item in products
+    )))
+
+
+async def _store_product_entry(
+    product_url: str,
+    description: str,
+    summary: str,
+    user_id: Optional[str] = None
+) -> Dict:
+    """Write the single LangCache entry describing one product."""
+    attributes = {
+        "type": "product",
+        "product_url": product_url,
+        "description": description,
+    }
+    if user_id:
+        attributes["user_id"] = user_id
     
-    # Store summary entry
-    summary_attributes = {**base_attributes, "type": "product_summary"}
-    results["summary_entry"] = lang_cache.set(
-        prompt=f"product_summary:{product_url[:50]}:{summary[:40]}",
+    # The summary is both the searchable prompt and the cached response
+    product_entry = await lang_cache.set_async(
+        prompt=summary,
         response=summary,
-        attributes=summary_attributes
+        attributes=attributes
     )
     
-    return results
+    return {"product_entry": product_entry}
 
 
 @tool
-def get_products(
+async def get_products(
     query: str,
     user_id: Optional[str] = None,
     limit: int = 10
@@ -147,73 +367,30 @@ def get_products(
         List of product entries, each containing URL, description, and summary.
     """
     # Build attributes for filtering
-    attributes = {"type": "product_summary"}
+    attributes = {"type": "product"}
     if user_id:
         attributes["user_id"] = user_id
     
-    # Search using semantic matching on summaries
-    res = lang_cache.search(
+    # Attributes filter exactly, the query is matched semantically against summaries
+    res = await lang_cache.search_async(
         prompt=query,
         attributes=attributes,
         similarity_threshold=0.01,  # Low threshold to allow semantic matching
-        search_strategies=[SearchStrategy.EXACT]  # Exact match on attributes, semantic on content
+        search_strategies=[SearchStrategy.SEMANTIC],
+        max_results=limit  # The SDK returns a single entry by default
     )
     
-    # Extract entries
-    entries = res.get("entries", []) if isinstance(res, dict) else res
-    
-    if not entries:
-        return []
-    
-    # Limit results
-    summary_entries = entries[:limit]
-    
-    # For each summary entry, fetch the corresponding URL and description
-    products = []
-    for entry in summary_entries:
-        product_url = entry.get("attributes", {}).get("product_url", "")
-        if not product_url:
-            continue
-        
-        # Fetch URL and description entries for this product
-        url_attributes = {"product_url": product_url, "type": "product_url"}
-        if user_id:
-            url_attributes["user_id"] = user_id
-            
-        desc_attributes = {"product_url": product_url, "type": "product_description"}
-        if user_id:
-            desc_attributes["user_id"] = user_id
-        
-        # Get URL entry
-        url_res = lang_cache.search(
-            prompt=product_url,
-            attributes=url_attributes,
-            similarity_threshold=0.01,
-            search_strategies=[SearchStrategy.EXACT]
-        )
-        url_entries = url_res.get("entries", []) if isinstance(url_res, dict) else url_res
-        product_url_value = url_entries[0].get("response", product_url) if url_entries else product_url
-        
-        # Get description entry
-        desc_res = lang_cache.search(
-            prompt=f"description for {product_url}",
-            attributes=desc_attributes,
-            similarity_threshold=0.01,
-            search_strategies=[SearchStrategy.EXACT]
-        )
-        desc_entries = desc_res.get("entries", []) if isinstance(desc_res, dict) else desc_res
-        description = desc_entries[0].get("response", "") if desc_entries else ""
-        
-        # Combine into product result
-        products.append({
-            "url": product_url_value,
-            "description": description,
-            "summary": entry.get("response", ""),
-            "score": entry.get("score", 0.0),
-            "attributes": entry.get("attributes", {})
-        })
-    
-    return products
+    # Each entry holds the whole product, so no follow-up lookups are needed
+    return [
+        {
+            "url": entry.attributes.get("product_url", ""),
+            "description": entry.attributes.get("description", ""),
+            "summary": entry.response,
+            "score": entry.similarity,
+            "attributes": entry.attributes
+        }
+        for entry in res.data
+    ]
 
 
 def create_langcache_tool_node():
@@ -222,5 +399,5 @@ def create_langcache_tool_node():
     Keeps existing consumers (which expect a ToolNode instance) working.
     """
     return ToolNode(
-        tools=[store_product, get_products, summarize_product_text]
+        tools=[store_product, store_products, get_products, summarize_product_text]
     )
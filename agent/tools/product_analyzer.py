@@ -30,8 +30,8 @@ def analyze_product_marketing(
         and a question for the user to confirm or deny the findings.
     """
     
-    # Parse the suspected tactics
-    tactics_list = [tactic.strip() for tactic in suspected_tactics.split(',') if tactic.strip()]
+    # Parse the suspected tactics, stripping each one once and dropping empties
+    tactics = filter(None, map(str.strip, suspected_tactics.split(',')))
     
     # Generate a question for the user
     user_question = (
@@ -45,6 +45,6 @@ def analyze_product_marketing(
         "productLink": product_link,
         "imageUrl": image_url,
         "description": description,
-        "manipulativeTactics": "|".join(tactics_list),  # Use pipe delimiter for easy splitting in frontend
+        "manipulativeTactics": "|".join(tactics),  # Use pipe delimiter for easy splitting in frontend
         "userQuestion": user_question,
     }
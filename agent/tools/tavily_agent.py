@@ -9,6 +9,22 @@ from pydantic import BaseModel, Field
 from tavily import TavilyClient
 
 
+# Read once at import so missing configuration fails fast
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+if not TAVILY_API_KEY:
+    raise RuntimeError("TAVILY_API_KEY missing from environment")
+
+_tavily_client: Optional[TavilyClient] = None
+
+
+def _get_client() -> TavilyClient:
+    """Return the shared TavilyClient so its HTTP session is reused across searches."""
+    global _tavily_client
+    if _tavily_client is None:
+        _tavily_client = TavilyClient(api_key=TAVILY_API_KEY)
+    return _tavily_client
+
+
 class TavilySearchInput(BaseModel):
     query: str = Field(..., description="User search query")
     depth: str = Field(
@@ -49,11 +65,7 @@ def tavily_search(
     `ToolNode` if needed.
     """
 
-    tavily_api_key = os.getenv("TAVILY_API_KEY")
-    if not tavily_api_key:
-        raise RuntimeError("TAVILY_API_KEY missing from environment")
-
-    client = TavilyClient(api_key=tavily_api_key)
+    client = _get_client()
 
     options = {
         "max_results": max_results,